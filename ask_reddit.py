@@ -120,7 +120,12 @@ async def ask_query():
     try:
         # Create and run agent
         agent = AutonomousRedditConsensus()
-        result = await agent.process_query(query)
+        try:
+            result = await agent.process_query(query)
+        finally:
+            # Per-query OpenAI client; the shared Reddit session stays open
+            # for later queries and is closed when the session ends
+            await agent.client.close()
 
         # Show results
         agent.print_results()
@@ -166,13 +171,19 @@ async def main():
     print_colored("SUCCESS", "Ready to analyze Reddit discussions!")
 
     # Main query loop
-    while True:
-        success = await ask_query()
-
-        if success and ask_continue():
-            continue
-        else:
-            break
+    try:
+        while True:
+            success = await ask_query()
+
+            if success and ask_continue():
+                continue
+            else:
+                break
+    finally:
+        # Tools share one Reddit session for the whole run; close it on exit
+        from reddit_consensus.tools import close_reddit_client
+
+        await close_reddit_client()
 
     print()
     print_colored("SUCCESS", "Thanks for using Reddit Consensus Agent!")
@@ -1,6 +1,14 @@
 """Reddit Consensus Agent - Autonomous AI agent for Reddit community analysis."""
 
-from .recommender import AutonomousRedditConsensus
-
 __version__ = "0.1.2"
 __all__ = ["AutonomousRedditConsensus"]
+
+
+def __getattr__(name):
+    # Imported lazily so the CLI can start (and fail fast on missing keys)
+    # without loading openai and asyncpraw.
+    if name == "AutonomousRedditConsensus":
+        from .recommender import AutonomousRedditConsensus
+
+        return AutonomousRedditConsensus
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
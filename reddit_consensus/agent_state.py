@@ -4,12 +4,13 @@ from typing import Any
 from .colors import print_colored
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """Tracks the agent's reasoning process and gathered information"""
 
     original_query: str = ""
     research_data: dict[str, Any] = field(default_factory=dict)
+    post_titles: dict[str, str] = field(default_factory=dict)
     reasoning_steps: list[str] = field(default_factory=list)
     draft_recommendations: list[dict] = field(default_factory=list)
     final_recommendations: list[dict] = field(default_factory=list)
@@ -0,0 +1,65 @@
+"""
+On-disk cache of finished query results.
+Repeated questions are answered from disk instead of re-running the full agent.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from .config import DEFAULT_QUERY_CACHE_DIR, DEFAULT_QUERY_CACHE_TTL_SECONDS
+
+
+def _cache_path(query: str, cache_dir: str) -> Path:
+    """Map a query to its cache file, ignoring case and extra whitespace"""
+    normalised = " ".join(query.lower().split())
+    key = hashlib.blake2b(normalised.encode(), digest_size=16).hexdigest()
+    return Path(cache_dir) / f"{key}.json"
+
+
+def load_cached_result(
+    query: str,
+    cache_dir: str = DEFAULT_QUERY_CACHE_DIR,
+    ttl_seconds: int = DEFAULT_QUERY_CACHE_TTL_SECONDS,
+) -> dict[str, Any] | None:
+    """Return the cached result for a query, or None if missing, expired or malformed."""
+    try:
+        entry = json.loads(_cache_path(query, cache_dir).read_text())
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+    if not _is_valid_entry(entry):
+        return None
+    if time.time() - entry["ts"] > ttl_seconds:
+        return None
+    return entry["result"]
+
+
+def _is_valid_entry(entry: Any) -> bool:
+    """Check an entry has the shape callers index into without guarding"""
+    if not isinstance(entry, dict):
+        return False
+    ts, result = entry.get("ts"), entry.get("result")
+    return (
+        isinstance(ts, int | float)
+        and isinstance(result, dict)
+        and isinstance(result.get("recommendations"), list)
+        and isinstance(result.get("steps"), int)
+    )
+
+
+def store_cached_result(
+    query: str, result: dict[str, Any], cache_dir: str = DEFAULT_QUERY_CACHE_DIR
+) -> None:
+    """Persist a finished result. Failures are ignored - the cache is best effort."""
+    path = _cache_path(query, cache_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"ts": time.time(), "result": result}))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        pass
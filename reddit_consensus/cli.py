@@ -6,45 +6,53 @@ Ask Reddit for insights and get balanced perspectives from community discussions
 """
 
 import asyncio
+import functools
 import getpass
 import os
 
 from rich.panel import Panel
 from rich.prompt import Prompt
 
-from .colors import console, print_colored, print_phase_header
-from .recommender import AutonomousRedditConsensus
+from .cache import load_cached_result, store_cached_result
+from .colors import (
+    console,
+    print_additional_notes,
+    print_colored,
+    print_phase_header,
+    print_recommendations_table,
+)
+from .config import REDDIT_ENV_VARS
+
+REQUIRED_ENV_VARS = ("OPENAI_API_KEY", *REDDIT_ENV_VARS.values())
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_env() -> tuple[str, ...]:
+    """Return required environment variables that are not set.
+
+    Cached for the session; call ``_probe_env.cache_clear()`` after changing
+    the environment (see ``setup_reddit_keys``).
+    """
+    return tuple(key for key in REQUIRED_ENV_VARS if not os.getenv(key))
 
 
 def check_api_keys():
     """Check if API keys are available"""
     print_phase_header("Reddit Consensus Agent", "Checking API configuration...")
 
-    missing_keys = []
+    missing_keys = list(_probe_env())
 
     # Check OpenAI
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if openai_key:
+    if "OPENAI_API_KEY" not in missing_keys:
         print_colored("SUCCESS", "OpenAI API key found")
     else:
         print_colored("ERROR", "OpenAI API key missing")
-        missing_keys.append("OPENAI_API_KEY")
 
     # Check Reddit keys
-    reddit_client_id = os.getenv("REDDIT_CLIENT_ID")
-    reddit_client_secret = os.getenv("REDDIT_CLIENT_SECRET")
-    reddit_user_agent = os.getenv("REDDIT_USER_AGENT")
-
-    if reddit_client_id and reddit_client_secret and reddit_user_agent:
+    if not any(key.startswith("REDDIT_") for key in missing_keys):
         print_colored("SUCCESS", "Reddit API credentials found")
     else:
         print_colored("ERROR", "Reddit API credentials missing")
-        if not reddit_client_id:
-            missing_keys.append("REDDIT_CLIENT_ID")
-        if not reddit_client_secret:
-            missing_keys.append("REDDIT_CLIENT_SECRET")
-        if not reddit_user_agent:
-            missing_keys.append("REDDIT_USER_AGENT")
 
     # If any keys missing, show instructions
     if missing_keys:
@@ -91,6 +99,7 @@ def setup_reddit_keys():
     os.environ["REDDIT_CLIENT_ID"] = client_id
     os.environ["REDDIT_CLIENT_SECRET"] = client_secret
     os.environ["REDDIT_USER_AGENT"] = user_agent
+    _probe_env.cache_clear()
 
     print_colored("SUCCESS", "Reddit credentials set for this session")
     return True
@@ -118,12 +127,29 @@ async def ask_query():
     print()
 
     try:
-        # Create and run agent
-        agent = AutonomousRedditConsensus()
-        result = await agent.process_query(query)
-
-        # Show results
-        agent.print_results()
+        result = load_cached_result(query)
+        if result is not None and ask_use_cached():
+            # Show cached results
+            print_phase_header("Final Insights", "Cached answer for this query")
+            print_recommendations_table(result["recommendations"])
+            print_additional_notes(result.get("additional_notes", ""))
+        else:
+            # Deferred: openai/asyncpraw are only needed once a query runs
+            from .recommender import AutonomousRedditConsensus
+
+            # Create and run agent
+            agent = AutonomousRedditConsensus()
+            try:
+                result = await agent.process_query(query)
+            finally:
+                # Per-query OpenAI client; the shared Reddit session stays open
+                # for later queries and is closed when the session ends
+                await agent.client.close()
+            if _is_cacheable(result):
+                store_cached_result(query, result)
+
+            # Show results
+            agent.print_results()
 
         # Show summary
         print()
@@ -139,6 +165,24 @@ async def ask_query():
         return False
 
 
+def ask_use_cached():
+    """Ask whether to reuse a cached answer or refresh it"""
+    response = Prompt.ask(
+        "[bold green]Found a recent answer for this query. Use it?[/bold green]",
+        choices=["y", "n"],
+        default="y",
+    )
+    return response.lower() == "y"
+
+
+def _is_cacheable(result):
+    """Only cache real answers, not the parse-failure fallback"""
+    recommendations = result.get("recommendations") or []
+    return bool(recommendations) and all(
+        rec.get("name") != "Error" for rec in recommendations
+    )
+
+
 def ask_continue():
     """Ask if user wants to continue"""
     print()
@@ -166,13 +210,19 @@ async def interactive_main():
     print_colored("SUCCESS", "Ready to analyze Reddit discussions!")
 
     # Main query loop
-    while True:
-        success = await ask_query()
-
-        if success and ask_continue():
-            continue
-        else:
-            break
+    try:
+        while True:
+            success = await ask_query()
+
+            if success and ask_continue():
+                continue
+            else:
+                break
+    finally:
+        # Tools share one Reddit session for the whole run; close it on exit
+        from .tools import close_reddit_client
+
+        await close_reddit_client()
 
     print()
     print_colored("SUCCESS", "Thanks for using Reddit Consensus Agent!")
@@ -98,17 +98,35 @@ def create_tool_table(tool_results: list[dict[str, Any]]) -> Table:
     return table
 
 
+def _result_data(result: dict[str, Any]) -> dict[str, Any] | None:
+    """Parsed result dict, reusing the agent's decode when it provided one"""
+    if "result_data" in result:
+        return result["result_data"]
+    try:
+        data = json.loads(result.get("result", ""))
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _loads_dict(result_json: str) -> dict[str, Any]:
+    """Decode a raw result for the legacy string-based printers"""
+    try:
+        data = json.loads(result_json)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 def _extract_details(result: dict[str, Any]) -> str:
     """Extract concise details from tool result"""
     tool_name = result.get("tool_name")
-    result_data = result.get("result", "")
+    data = _result_data(result)
 
-    if not result_data:
+    if not data:
         return "Completed"
 
     try:
-        data = json.loads(result_data)
-
         if tool_name == "reddit_search_for_posts" and "results" in data:
             posts = data["results"]
             subreddits = set()
@@ -196,7 +214,7 @@ def create_result_panels(tool_results: list[dict[str, Any]]) -> list[Panel]:
 
     for result in tool_results:
         tool_name = result.get("tool_name")
-        result_data = result.get("result", "")
+        result_data = _result_data(result)
 
         if tool_name == "reddit_search_for_posts" and result_data:
             panel = _create_search_panel(result_data)
@@ -214,10 +232,9 @@ def create_result_panels(tool_results: list[dict[str, Any]]) -> list[Panel]:
     return panels
 
 
-def _create_search_panel(result_json: str) -> Panel | None:
+def _create_search_panel(data: dict[str, Any]) -> Panel | None:
     """Create search results panel"""
     try:
-        data = json.loads(result_json)
         if not data.get("results"):
             return None
 
@@ -258,10 +275,9 @@ def _create_search_panel(result_json: str) -> Panel | None:
         return None
 
 
-def _create_hierarchical_comments_panel(result_json: str) -> Panel | None:
+def _create_hierarchical_comments_panel(data: dict[str, Any]) -> Panel | None:
     """Create hierarchical comments panel with tree structure"""
     try:
-        data = json.loads(result_json)
         if not data.get("comment_tree"):
             return None
 
@@ -311,10 +327,9 @@ def _create_hierarchical_comments_panel(result_json: str) -> Panel | None:
         return None
 
 
-def _create_comments_panel(result_json: str) -> Panel | None:
+def _create_comments_panel(data: dict[str, Any]) -> Panel | None:
     """Create comments panel"""
     try:
-        data = json.loads(result_json)
         if not data.get("comments"):
             return None
 
@@ -459,12 +474,12 @@ def print_tool_table(tool_results: list, title: str = "Tool Execution") -> None:
 
 
 def print_post_search_results(result_json: str) -> None:
-    panel = _create_search_panel(result_json)
+    panel = _create_search_panel(_loads_dict(result_json))
     if panel:
         console.print(panel)
 
 
 def print_comment_search_results(result_json: str) -> None:
-    panel = _create_comments_panel(result_json)
+    panel = _create_comments_panel(_loads_dict(result_json))
     if panel:
         console.print(panel)
@@ -4,6 +4,7 @@ Centralized configuration for easy maintenance and tuning.
 """
 
 import os
+from dataclasses import dataclass
 
 # LLM Model Configuration
 DEFAULT_MODEL_NAME = "gpt-4.1-mini"  # Default OpenAI model to use
@@ -31,6 +32,8 @@ DEFAULT_UI_TITLE_PREVIEW_LENGTH = 40  # Maximum length for title preview text
 # Performance configuration
 DEFAULT_TIMEOUT_SECONDS = 30  # Default timeout for Reddit API calls
 DEFAULT_RETRY_ATTEMPTS = 3  # Number of retry attempts for failed requests
+DEFAULT_MAX_CONCURRENT_TOOLS = 6  # Cap on Reddit tool calls in flight at once
+DEFAULT_MAX_CONCURRENT_COMMENT_FETCHES = 8  # Cap on per-post comment loads within one search
 
 # LLM configuration
 DEFAULT_REASONING_STEPS_LIMIT = (
@@ -43,10 +46,55 @@ DEFAULT_RECOMMENDATION_COUNT = 3  # Default number of recommendations to generat
 DEFAULT_REQUEST_DELAY = 0.1  # Minimum seconds between API requests
 DEFAULT_SUMMARIZATION_TRIGGER_TOKENS = 15000  # Start summarization at 15K tokens (more aggressive)
 DEFAULT_PROMPT_HARD_LIMIT = 28000  # Maximum prompt size before rejection
+DEFAULT_CONTEXT_SNIPPET_LENGTH = 200  # Comment text kept per top-level comment in the reasoning context
+
+# Query result cache configuration
+DEFAULT_QUERY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "reddit_consensus")
+DEFAULT_QUERY_CACHE_TTL_SECONDS = 24 * 60 * 60  # Reuse finished answers for a day
 
 # Summarization model configuration
 # Summarization configuration uses same request pacing as main model
 
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable bundle of the defaults above.
+
+    Hot paths can hold one ``CONFIG`` reference instead of importing many
+    module globals; the ``DEFAULT_*`` names remain for existing callers.
+    """
+
+    model_name: str = DEFAULT_MODEL_NAME
+    model_max_tokens: int = DEFAULT_MODEL_MAX_TOKENS
+    summarization_model: str = DEFAULT_SUMMARIZATION_MODEL
+    summarization_max_tokens: int = DEFAULT_SUMMARIZATION_MAX_TOKENS
+    max_depth: int = DEFAULT_MAX_DEPTH
+    max_comments: int = DEFAULT_MAX_COMMENTS
+    replace_more_limit: int = DEFAULT_REPLACE_MORE_LIMIT
+    sort_by_score: bool = DEFAULT_SORT_BY_SCORE
+    adaptive_percentile: int = DEFAULT_ADAPTIVE_PERCENTILE
+    search_results: int = DEFAULT_SEARCH_RESULTS
+    ui_tree_display_depth: int = DEFAULT_UI_TREE_DISPLAY_DEPTH
+    ui_comment_preview_length: int = DEFAULT_UI_COMMENT_PREVIEW_LENGTH
+    ui_title_preview_length: int = DEFAULT_UI_TITLE_PREVIEW_LENGTH
+    timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS
+    retry_attempts: int = DEFAULT_RETRY_ATTEMPTS
+    max_concurrent_tools: int = DEFAULT_MAX_CONCURRENT_TOOLS
+    max_concurrent_comment_fetches: int = DEFAULT_MAX_CONCURRENT_COMMENT_FETCHES
+    reasoning_steps_limit: int = DEFAULT_REASONING_STEPS_LIMIT
+    minimum_sources: int = DEFAULT_MINIMUM_SOURCES
+    recommendation_count: int = DEFAULT_RECOMMENDATION_COUNT
+    request_delay: float = DEFAULT_REQUEST_DELAY
+    summarization_trigger_tokens: int = DEFAULT_SUMMARIZATION_TRIGGER_TOKENS
+    prompt_hard_limit: int = DEFAULT_PROMPT_HARD_LIMIT
+    context_snippet_length: int = DEFAULT_CONTEXT_SNIPPET_LENGTH
+    query_cache_dir: str = DEFAULT_QUERY_CACHE_DIR
+    query_cache_ttl_seconds: int = DEFAULT_QUERY_CACHE_TTL_SECONDS
+
+
+CONFIG = Config()
+
 # Reddit API Configuration
 REDDIT_ENV_VARS = {
     "client_id": "REDDIT_CLIENT_ID",
@@ -3,36 +3,52 @@ Prompt templates for the Reddit Consensus system.
 Centralizes all LLM prompts for better maintainability.
 """
 
+import json
+from string import Template
+
 from .config import (
     DEFAULT_MAX_DEPTH,
     DEFAULT_RECOMMENDATION_COUNT,
 )
 
+__all__ = [
+    "get_reasoning_prompt",
+    "get_draft_recommendations_prompt",
+    "get_critique_prompt",
+    "get_final_recommendations_prompt",
+    "get_search_results_summary_prompt",
+    "get_comments_summary_prompt",
+    "get_research_data_summary_prompt",
+]
 
-def get_reasoning_prompt(
-    tools_description: str,
-    original_query: str,
-    research_data_keys: list,
-    reasoning_steps_count: int,
-    context: str,
-) -> str:
-    """Generate the main reasoning turn prompt."""
-    return f"""You are a Reddit consensus agent that finds great suggestions by analyzing Reddit discussions. Your goal is to discover what Reddit users are actually recommending and loving.
 
-Available tools:
-{tools_description}
+def _format_research_data(research_data: dict) -> str:
+    """Render research data as one "key: result" line per tool call.
+
+    Tool results are already JSON strings; interpolating the dict directly
+    would repr them with escaped quotes and newlines, inflating the prompt.
+    """
+    return "\n".join(f"{key}: {value}" for key, value in research_data.items())
 
-Current state:
-- Query: {original_query}
-- Previous searches: {research_data_keys}
-- Steps taken: {reasoning_steps_count}
 
-Context: {context}
+# Templates are parsed once at import; only the dynamic fields are substituted
+# per call. JSON braces are literal here, but a literal "$" must be written "$$".
+# Static instructions come first and per-turn state last, so consecutive turns
+# share a byte-identical prefix that the provider's prompt cache can reuse.
+# The research context only ever grows by appending, so it sits ahead of the
+# counters that change every turn.
+
+_REASONING_TEMPLATE = Template(
+    """You are a Reddit consensus agent that finds great suggestions by analyzing Reddit discussions. Your goal is to discover what Reddit users are actually recommending and loving.
+
+Available tools:
+$tools_description
 
 Instructions:
 - Search Reddit for posts where people discuss, recommend, or ask about similar items/experiences
 - Look for posts with good engagement (upvotes, comments) as they indicate quality discussions
 - CRITICAL: Get comments from promising posts to analyze how users perceive the OP's insights
+- To skim several posts at once, pass "include_top_comments": N to reddit_search_for_posts to get each post's top N comments with the search
 - Analyze comment sentiment: Are users agreeing, disagreeing, or adding better alternatives?
 - Look for patterns: Multiple users mentioning the same places/products indicates strong consensus
 - Pay attention to upvoted comments - these represent community-validated opinions
@@ -48,78 +64,111 @@ AVOID REPETITION: Don't search for the same or nearly identical terms repeatedly
 Respond in JSON format.
 
 For single tool use:
-{{
+{
     "action": "use_tool",
     "tool_name": "reddit_search_for_posts",
-    "tool_params": {{"query": "specific search query"}},
+    "tool_params": {"query": "specific search query"},
     "reasoning": "why you're using this tool"
-}}
+}
 
 For multiple tools (RECOMMENDED - much faster):
-{{
+{
     "action": "use_tools",
     "tools": [
-        {{
+        {
             "tool_name": "reddit_search_for_posts",
-            "tool_params": {{"query": "search query 1"}}
-        }},
-        {{
+            "tool_params": {"query": "search query 1"}
+        },
+        {
             "tool_name": "reddit_get_post_comments",
-            "tool_params": {{"post_id": "post_id_here"}}
-        }},
-        {{
+            "tool_params": {"post_id": "post_id_here"}
+        },
+        {
             "tool_name": "reddit_get_post_comments",
-            "tool_params": {{"post_id": "post_id_here", "max_depth": {DEFAULT_MAX_DEPTH}}}
-        }}
+            "tool_params": {"post_id": "post_id_here", "max_depth": $max_depth}
+        }
     ],
     "reasoning": "why you're using these tools together"
-}}
+}
 
 For finishing:
-{{
+{
     "action": "finalize",
     "reasoning": "why you have enough information to make insights"
-}}"""
+}
 
+Query: $original_query
 
-def get_draft_recommendations_prompt(
+Context: $context
+
+Current state:
+- Previous searches: $research_data_keys
+- Steps taken: $reasoning_steps_count"""
+)
+
+
+def get_reasoning_prompt(
+    tools_description: str,
     original_query: str,
-    research_data: dict,
-    reasoning_steps: list,
-    recommendation_count: int = DEFAULT_RECOMMENDATION_COUNT,
+    research_data_keys: list,
+    reasoning_steps_count: int,
+    context: str,
 ) -> str:
-    """Generate the draft insights prompt."""
-    return f"""Based on your Reddit research so far, create {recommendation_count} draft insights for the user.
-
-Original Query: {original_query}
+    """Generate the main reasoning turn prompt."""
+    return _REASONING_TEMPLATE.substitute(
+        tools_description=tools_description,
+        max_depth=DEFAULT_MAX_DEPTH,
+        original_query=original_query,
+        research_data_keys=", ".join(map(str, research_data_keys)) or "(none)",
+        reasoning_steps_count=reasoning_steps_count,
+        context=context,
+    )
 
-Reddit Research: {research_data}
 
-Research Process: {reasoning_steps}
+_DRAFT_RECOMMENDATIONS_TEMPLATE = Template(
+    """Based on your Reddit research so far, create $recommendation_count draft insights for the user.
 
-Create {recommendation_count} draft insights based on what you've found. These will be critiqued next.
+Create $recommendation_count draft insights based on what you've found. These will be critiqued next.
 
 Focus on nuanced insights that capture different use cases or contexts, not just the most mentioned options.
 
 Return JSON object with:
-{{
+{
     "recommendations": [
-        {{
+        {
             "name": "Specific insight name",
             "description": "Brief description",
             "reasoning": "Why this seems good from Reddit research"
-        }}
+        }
     ]
-}}"""
+}
 
+Original Query: $original_query
 
-def get_critique_prompt(original_query: str, context: str) -> str:
-    """Generate the critique turn prompt."""
-    return f"""You have generated draft insights. Now critically analyze them by searching for potential issues or negative feedback.
+Reddit Research:
+$research_data
+
+Research Process: $reasoning_steps"""
+)
+
+
+def get_draft_recommendations_prompt(
+    original_query: str,
+    research_data: dict,
+    reasoning_steps: list,
+    recommendation_count: int = DEFAULT_RECOMMENDATION_COUNT,
+) -> str:
+    """Generate the draft insights prompt."""
+    return _DRAFT_RECOMMENDATIONS_TEMPLATE.substitute(
+        original_query=original_query,
+        research_data=_format_research_data(research_data),
+        reasoning_steps=json.dumps(reasoning_steps, ensure_ascii=False),
+        recommendation_count=recommendation_count,
+    )
 
-Original Query: {original_query}
 
-{context}
+_CRITIQUE_TEMPLATE = Template(
+    """You have generated draft insights. Now critically analyze them by searching for potential issues or negative feedback.
 
 Your task is to search for criticism, negative experiences, or issues with your draft insights. Look for:
 - Negative reviews or complaints
@@ -130,66 +179,65 @@ Your task is to search for criticism, negative experiences, or issues with your
 
 Search for discussions that contradict or provide nuance. Note: If the query has limited criticism potential (e.g., factual questions, non-controversial topics), do a basic search but don't force extensive critique - some topics simply don't have significant negative angles.
 
-CRITICAL: Avoid repeating identical or nearly identical searches. Check the context above for your previous search attempts - if you see the same search terms already tried, DO NOT repeat them. If previous searches returned irrelevant results, this is a clear signal that criticism doesn't exist on Reddit for this topic. Stop searching and finalize instead of wasting tokens on repetitive failed searches.
+CRITICAL: Avoid repeating identical or nearly identical searches. Check the context below for your previous search attempts - if you see the same search terms already tried, DO NOT repeat them. If previous searches returned irrelevant results, this is a clear signal that criticism doesn't exist on Reddit for this topic. Stop searching and finalize instead of wasting tokens on repetitive failed searches.
 
 Before searching, look at what you already tried. If you've already searched similar terms, either try completely different keywords or finalize if no relevant criticism exists.
 
 Respond in JSON format.
 
 For single tool use:
-{{
+{
     "action": "use_tool",
     "tool_name": "reddit_search_for_posts",
-    "tool_params": {{"query": "specific search query"}},
+    "tool_params": {"query": "specific search query"},
     "reasoning": "why you're searching for criticism"
-}}
+}
 
 For multiple tools (RECOMMENDED - critique all insights simultaneously):
-{{
+{
     "action": "use_tools",
     "tools": [
-        {{
+        {
             "tool_name": "reddit_search_for_posts",
-            "tool_params": {{"query": "criticism search 1"}}
-        }},
-        {{
+            "tool_params": {"query": "criticism search 1"}
+        },
+        {
             "tool_name": "reddit_search_for_posts",
-            "tool_params": {{"query": "criticism search 2"}}
-        }},
-        {{
+            "tool_params": {"query": "criticism search 2"}
+        },
+        {
             "tool_name": "reddit_get_post_comments",
-            "tool_params": {{"post_id": "post_id_here"}}
-        }}
+            "tool_params": {"post_id": "post_id_here"}
+        }
     ],
     "reasoning": "why you're using these tools together for critique"
-}}
+}
 
 For finishing critique:
-{{
+{
     "action": "finalize",
     "reasoning": "why you're done with critique"
-}}"""
+}
 
+Original Query: $original_query
 
-def get_final_recommendations_prompt(
-    original_query: str,
-    research_data: dict,
-    draft_recommendations: list,
-    recommendation_count: int = DEFAULT_RECOMMENDATION_COUNT,
-) -> str:
-    """Generate the final insights prompt."""
-    return f"""Based on your Reddit research AND critique findings, create {recommendation_count} balanced insights for the user.
+$context"""
+)
 
-Original Query: {original_query}
 
-Initial Reddit Research: {research_data}
+def get_critique_prompt(original_query: str, context: str) -> str:
+    """Generate the critique turn prompt."""
+    return _CRITIQUE_TEMPLATE.substitute(
+        original_query=original_query,
+        context=context,
+    )
 
-Draft Insights: {draft_recommendations}
 
-Critique Research: [Include any critique findings from additional research]
+_FINAL_RECOMMENDATIONS_TEMPLATE = Template(
+    """Based on your Reddit research AND critique findings, create $recommendation_count balanced insights for the user.
 
 Requirements:
-- Create {recommendation_count} final insights based on ALL research (initial + critique)
+- Create $recommendation_count final insights based on ALL research (initial + critique)
 - Include both positive aspects AND any discovered issues/criticisms
 - Show balanced perspective from Reddit community
 - Base everything on real Reddit comments and posts you found
@@ -198,27 +246,51 @@ Requirements:
 - Be complete, but tight in your framing
 
 Return JSON object with:
-{{
+{
     "recommendations": [
-        {{
+        {
             "name": "Specific insight name (from Reddit)",
             "description": "What it is and why Reddit users recommend it",
             "pros": "What Reddit users love about it",
             "cons": "Any issues, criticisms, or downsides found (if any)",
             "reasoning": "Overall assessment based on Reddit community feedback",
             "reddit_sources": ["Array of Reddit post URLs that supported this insight"]
-        }}
+        }
     ],
     "additional_notes": "Any additional context, general advice, warnings, or observations that applies broadly but doesn't fit into specific insights. Include things like: general trends you noticed, timing considerations, budget advice, common mistakes to avoid, or alternative approaches that came up during research."
-}}"""
+}
 
+Original Query: $original_query
 
-def get_search_results_summary_prompt(search_data: str) -> str:
-    """Generate prompt for summarizing Reddit search results."""
-    return f"""Summarize these Reddit search results, extracting key patterns and themes.
+Initial Reddit Research:
+$research_data
+
+Draft Insights: $draft_recommendations
+
+Critique Research: [Include any critique findings from additional research]"""
+)
+
+
+def get_final_recommendations_prompt(
+    original_query: str,
+    research_data: dict,
+    draft_recommendations: list,
+    recommendation_count: int = DEFAULT_RECOMMENDATION_COUNT,
+) -> str:
+    """Generate the final insights prompt."""
+    return _FINAL_RECOMMENDATIONS_TEMPLATE.substitute(
+        original_query=original_query,
+        research_data=_format_research_data(research_data),
+        draft_recommendations=json.dumps(draft_recommendations, ensure_ascii=False),
+        recommendation_count=recommendation_count,
+    )
+
+
+_SEARCH_RESULTS_SUMMARY_TEMPLATE = Template(
+    """Summarize these Reddit search results, extracting key patterns and themes.
 
 Search Results Data:
-{search_data}
+$search_data
 
 Instructions:
 - Identify the most frequently mentioned products/places/services
@@ -228,14 +300,19 @@ Instructions:
 - Keep summary under 200 words
 
 Return a concise summary focusing on actionable insights and consensus patterns."""
+)
 
 
-def get_comments_summary_prompt(comments_data: str) -> str:
-    """Generate prompt for summarizing Reddit comment analysis."""
-    return f"""Summarize these Reddit comments, focusing on community consensus and sentiment.
+def get_search_results_summary_prompt(search_data: str) -> str:
+    """Generate prompt for summarizing Reddit search results."""
+    return _SEARCH_RESULTS_SUMMARY_TEMPLATE.substitute(search_data=search_data)
+
+
+_COMMENTS_SUMMARY_TEMPLATE = Template(
+    """Summarize these Reddit comments, focusing on community consensus and sentiment.
 
 Comments Data:
-{comments_data}
+$comments_data
 
 Instructions:
 - Identify consensus vs disagreement patterns
@@ -246,14 +323,19 @@ Instructions:
 - Keep summary under 200 words
 
 Return a concise analysis of community sentiment and key takeaways."""
+)
 
 
-def get_research_data_summary_prompt(original_query: str, full_data: str) -> str:
-    """Generate prompt for overall research data synthesis."""
-    return f"""CRITICAL: Compress this Reddit research data into essential insights for: "{original_query}"
+def get_comments_summary_prompt(comments_data: str) -> str:
+    """Generate prompt for summarizing Reddit comment analysis."""
+    return _COMMENTS_SUMMARY_TEMPLATE.substitute(comments_data=comments_data)
+
+
+_RESEARCH_DATA_SUMMARY_TEMPLATE = Template(
+    """CRITICAL: Compress this Reddit research data into essential insights for: "$original_query"
 
 Full Research Data:
-{full_data}
+$full_data
 
 COMPRESSION REQUIREMENTS:
 - Extract ONLY the strongest insights with clear community support
@@ -278,3 +360,12 @@ Format as structured bullet points for maximum information density:
 - [Key Reddit post URLs that support findings]
 
 Focus on direct answers to the original query with specific, actionable information."""
+)
+
+
+def get_research_data_summary_prompt(original_query: str, full_data: str) -> str:
+    """Generate prompt for overall research data synthesis."""
+    return _RESEARCH_DATA_SUMMARY_TEMPLATE.substitute(
+        original_query=original_query,
+        full_data=full_data,
+    )
@@ -1,9 +1,12 @@
 import asyncio
 import json
+import logging
 import os
+import re
+from collections.abc import Coroutine
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from .agent_state import AgentState
 from .colors import (
@@ -13,34 +16,37 @@ from .colors import (
     print_recommendations_table,
     render_dashboard,
 )
+from .config import CONFIG
 from .prompts import (
     get_critique_prompt,
     get_draft_recommendations_prompt,
     get_final_recommendations_prompt,
     get_reasoning_prompt,
 )
-from .tools import reddit_get_post_comments, reddit_search_for_posts
+from .tools import (
+    close_reddit_client,
+    reddit_get_post_comments,
+    reddit_search_for_posts,
+)
+
+logger = logging.getLogger(__name__)
+
+# Leading ```/```json and trailing ``` around a model reply
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
 
 
 class AutonomousRedditConsensus:
     """Autonomous agent for Reddit consensus-driven insights"""
 
     def __init__(self, api_key: str | None = None, recommendation_count: int = None):
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        self.client = AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
         self.state = AgentState()
 
-        # Import here to avoid circular imports
-        from .config import (
-            DEFAULT_MODEL_MAX_TOKENS,
-            DEFAULT_MODEL_NAME,
-            DEFAULT_RECOMMENDATION_COUNT,
-        )
-
-        self.recommendation_count = recommendation_count or DEFAULT_RECOMMENDATION_COUNT
+        self.recommendation_count = recommendation_count or CONFIG.recommendation_count
 
         # Use simple config defaults
-        self.model_name = DEFAULT_MODEL_NAME
-        self.model_max_tokens = DEFAULT_MODEL_MAX_TOKENS
+        self.model_name = CONFIG.model_name
+        self.model_max_tokens = CONFIG.model_max_tokens
         
         # Simple token tracking 
         self.total_tokens_sent = 0  # What we upload to the model
@@ -53,14 +59,31 @@ class AutonomousRedditConsensus:
             "reddit_get_post_comments": reddit_get_post_comments,
         }
 
+        # Tool docstrings don't change at runtime, so build the description once
+        self._tools_description = self._build_tools_description()
+
         self.max_iterations = 10
 
+        # Bound parallel tool batches so a large LLM request can't trip
+        # Reddit's rate limits and end up serialized behind 429 backoffs
+        self._tool_semaphore = asyncio.Semaphore(CONFIG.max_concurrent_tools)
+
+        # Successful tool results keyed by tool name + canonical params, so the
+        # critique phase doesn't refetch posts the research phase already saw
+        # Each entry is (raw JSON, parsed dict) so hits need no re-decoding
+        self._tool_cache: dict[str, tuple[str, dict[str, Any]]] = {}
+
     # ===== UTILITY METHODS =====
 
     def _get_tools_description(self) -> str:
-        """Get available tools description from function docstrings"""
+        """Get the tools description built once in __init__"""
+        return self._tools_description
+
+    def _build_tools_description(self) -> str:
+        """Build available tools description from function docstrings"""
         descriptions = []
-        for name, func in self.tools.items():
+        # Sorted so the description is a stable part of the cached prompt prefix
+        for name, func in sorted(self.tools.items()):
             # Extract first line of docstring as description
             if func.__doc__:
                 desc = func.__doc__.strip().split("\n")[0]
@@ -73,10 +96,12 @@ class AutonomousRedditConsensus:
         """Call LLM with simple retry logic for JSON parsing"""
         for attempt in range(2):
             try:
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model_name,
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=self.model_max_tokens,
+                    # JSON mode guarantees a parseable object; every prompt asks for one
+                    response_format={"type": "json_object"},
                 )
 
                 # Track token usage
@@ -88,24 +113,21 @@ class AutonomousRedditConsensus:
                 content = response.choices[0].message.content.strip()
 
                 # Remove any markdown code blocks if present
-                if content.startswith("```json"):
-                    content = content[7:-3].strip()
-                elif content.startswith("```"):
-                    content = content[3:-3].strip()
+                content = _CODE_FENCE_RE.sub("", content)
 
                 parsed = json.loads(content)
                 return parsed
 
             except json.JSONDecodeError as e:
-                print(f"JSON parse error (attempt {attempt + 1}): {e}")
+                logger.warning("JSON parse error (attempt %d): %s", attempt + 1, e)
                 if attempt == 0:
-                    print("Retrying...")
+                    logger.debug("Retrying...")
                     continue
                 else:
-                    print(f"Raw response: {response.choices[0].message.content}")
+                    logger.debug("Raw response: %s", response.choices[0].message.content)
                     return fallback_result
             except Exception as e:
-                print(f"LLM call error: {e}")
+                logger.warning("LLM call error: %s", e)
                 return fallback_result
 
         return fallback_result
@@ -127,10 +149,30 @@ class AutonomousRedditConsensus:
             post_title = self._find_post_title(post_id)
             print_colored("POST", f"{prefix}Post: {post_title[:80]}...")
 
-    def _log_tool_results(self, tool_name: str, result: str, prefix: str = "") -> None:
-        """Log tool execution results in a readable format"""
+    def _log_tool_done(
+        self, tool_name: str, params: dict[str, Any], prefix: str = ""
+    ) -> None:
+        """Log one tool's completion within a parallel batch"""
+        from .colors import get_friendly_tool_name
+
+        friendly_name = get_friendly_tool_name(tool_name)
+        console.print(f"   [green][DONE][/green] {prefix}{friendly_name}: ", end="")
+        if tool_name == "reddit_search_for_posts":
+            console.print(f"'{params.get('query', 'N/A')}'")
+        elif tool_name == "reddit_get_post_comments":
+            post_id = params.get("post_id", "N/A")
+            post_title = self._find_post_title(post_id)
+            console.print(f"'{post_title[:50]}...'")
+        else:
+            console.print("completed")
+
+    def _log_tool_results(
+        self, tool_name: str, result_data: dict[str, Any] | None, prefix: str = ""
+    ) -> None:
+        """Log already-parsed tool results in a readable format"""
+        if result_data is None:
+            return
         try:
-            result_data = json.loads(result)
             if tool_name == "reddit_search_for_posts" and "results" in result_data:
                 print(f"   {prefix}Found {len(result_data['results'])} posts:")
                 for post in result_data["results"][:3]:  # Show first 3
@@ -152,7 +194,7 @@ class AutonomousRedditConsensus:
                 )
                 if result_data.get("post_title"):
                     print(f"   {prefix}Post: {result_data['post_title'][:80]}...")
-        except (json.JSONDecodeError, KeyError):
+        except (KeyError, TypeError):
             pass
 
     def _count_replies(self, comment: dict[str, Any]) -> int:
@@ -184,12 +226,13 @@ class AutonomousRedditConsensus:
         mode: str,
         iteration: int,
         prefix: str,
-        context: str,
-    ) -> str:
+        context_parts: list[str],
+    ) -> None:
         """Store tool execution results with consistent key generation"""
         for tool_result in results:
             tool_name = tool_result["tool_name"]
             result = tool_result["result"]
+            result_data = tool_result["result_data"]
 
             # Generate consistent storage key
             if len(results) == 1:
@@ -200,9 +243,68 @@ class AutonomousRedditConsensus:
                 data_key = f"{mode}_{tool_name}_{iteration}_{tool_result['index']}"
 
             self.state.add_research_data(data_key, result)
-            context += f"\n\n{prefix}Tool {tool_name}: {result}"
+            if tool_name == "reddit_search_for_posts":
+                self._index_post_titles(result_data)
+            summary = self._summarize_tool_result(tool_name, result, result_data)
+            context_parts.append(f"\n\n{prefix}Tool {tool_name} [{data_key}]: {summary}")
 
-        return context
+    def _summarize_tool_result(
+        self, tool_name: str, result: str, result_data: dict[str, Any] | None
+    ) -> str:
+        """Compact stand-in for a tool result in the reasoning context.
+
+        The full JSON stays in research_data under its key for the draft and
+        final prompts; the loop only needs enough to choose its next step.
+        """
+        if result_data is None or result_data.get("status") != "success":
+            return result
+
+        if tool_name == "reddit_search_for_posts":
+            posts = []
+            for post in result_data.get("results", []):
+                post_summary = {
+                    "post_id": post.get("post_id"),
+                    "title": post.get("title"),
+                    "score": post.get("score"),
+                    "num_comments": post.get("num_comments"),
+                }
+                # Comments fetched with include_top_comments are what let the
+                # loop skip a follow-up comments call, so keep them visible
+                if post.get("top_comments"):
+                    # Prefetched comments carry no reply trees to count
+                    post_summary["top_comments"] = self._summarize_comments(
+                        post["top_comments"], count_replies=False
+                    )
+                posts.append(post_summary)
+            summary = {"query": result_data.get("query"), "posts": posts}
+        elif tool_name == "reddit_get_post_comments":
+            summary = {
+                "post_id": result_data.get("post_id"),
+                "post_title": result_data.get("post_title"),
+                "top_comments": self._summarize_comments(
+                    result_data.get("comment_tree", [])
+                ),
+            }
+        else:
+            return result
+
+        return json.dumps(summary, ensure_ascii=False)
+
+    def _summarize_comments(
+        self, comments: list[dict[str, Any]], count_replies: bool = True
+    ) -> list[dict[str, Any]]:
+        """Score, truncated text and (optionally) reply count for each top-level comment"""
+        snippet_length = CONFIG.context_snippet_length
+        summaries = []
+        for comment in comments:
+            summary = {
+                "score": comment.get("score"),
+                "text": comment.get("text", "")[:snippet_length],
+            }
+            if count_replies:
+                summary["replies"] = self._count_replies(comment)
+            summaries.append(summary)
+        return summaries
 
     # ===== REASONING TURNS =====
 
@@ -223,7 +325,7 @@ class AutonomousRedditConsensus:
         parsed = await self._call_llm_with_json_retry(prompt, fallback_result)
 
         if not isinstance(parsed, dict) or "action" not in parsed:
-            print(f"Invalid response format: {parsed}")
+            logger.warning("Invalid response format: %s", parsed)
             return {"action": "finalize", "reasoning": "Invalid response format"}
         return parsed
 
@@ -240,21 +342,50 @@ class AutonomousRedditConsensus:
         parsed = await self._call_llm_with_json_retry(prompt, fallback_result)
 
         if not isinstance(parsed, dict) or "action" not in parsed:
-            print(f"Invalid response format: {parsed}")
+            logger.warning("Invalid response format: %s", parsed)
             return {"action": "finalize", "reasoning": "Invalid response format"}
         return parsed
 
     # ===== TOOL EXECUTION =====
 
-    async def _execute_single_tool(self, tool_name: str, params: dict[str, Any]) -> str:
-        """Execute a single tool without logging"""
+    async def _execute_single_tool(
+        self, tool_name: str, params: dict[str, Any]
+    ) -> tuple[str, dict[str, Any] | None]:
+        """Execute a single tool without logging.
+
+        Returns the raw result with its JSON parsed once here, so callers
+        never decode the same payload again (None for non-JSON errors).
+        """
         if tool_name not in self.tools:
-            return f"Tool {tool_name} not found"
+            return f"Tool {tool_name} not found", None
+
+        cache_key = self._tool_cache_key(tool_name, params)
+        if cache_key in self._tool_cache:
+            return self._tool_cache[cache_key]
 
         try:
-            return await self.tools[tool_name](**params)
+            async with self._tool_semaphore:
+                result = await self.tools[tool_name](**params)
         except Exception as e:
-            return f"Error: {str(e)}"
+            return f"Error: {str(e)}", None
+
+        result_data = self._parse_result(result)
+        # Only successful results are cached; errors may be transient
+        if result_data is not None and result_data.get("status") == "success":
+            self._tool_cache[cache_key] = (result, result_data)
+        return result, result_data
+
+    def _tool_cache_key(self, tool_name: str, params: dict[str, Any]) -> str:
+        """Build a cache key that ignores parameter order"""
+        return f"{tool_name}|{json.dumps(params, sort_keys=True, default=str)}"
+
+    def _parse_result(self, result: str) -> dict[str, Any] | None:
+        """Parse a tool result; non-JSON results (errors) yield None"""
+        try:
+            result_data = json.loads(result)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        return result_data if isinstance(result_data, dict) else None
 
     async def _execute_tools(
         self,
@@ -269,6 +400,8 @@ class AutonomousRedditConsensus:
             )
 
         tasks = []
+        calls: list[Coroutine[Any, Any, tuple[str, dict[str, Any] | None]]] = []
+        call_index_by_key: dict[str, int] = {}
         for i, tool_request in enumerate(tool_requests):
             tool_name = tool_request.get("tool_name")
             params = tool_request.get("tool_params", {})
@@ -277,69 +410,61 @@ class AutonomousRedditConsensus:
             if log_results and len(tool_requests) == 1:
                 self._log_tool_start(tool_name, params, prefix)
 
-            # Create async task for each tool
-            task = self._execute_single_tool(tool_name, params)
-            tasks.append((i, tool_name, params, task))
+            # Duplicate requests in one batch share a single call
+            key = self._tool_cache_key(tool_name, params)
+            if key not in call_index_by_key:
+                call_index_by_key[key] = len(calls)
+                calls.append(self._execute_single_tool(tool_name, params))
+            tasks.append((i, tool_name, params, call_index_by_key[key]))
 
-        # Execute all tasks in parallel
+        # Execute all unique calls in parallel
         results = []
-        completed_tasks = await asyncio.gather(
-            *[task for _, _, _, task in tasks], return_exceptions=True
-        )
+        completed_calls = await asyncio.gather(*calls, return_exceptions=True)
 
         # Process results and maintain order
-        for i, (original_index, tool_name, params, _) in enumerate(tasks):
-            result = completed_tasks[i]
-            if isinstance(result, Exception):
-                result = f"Error: {str(result)}"
+        for original_index, tool_name, params, call_index in tasks:
+            outcome = completed_calls[call_index]
+            # BaseException, not Exception: a cancelled call comes back as
+            # CancelledError and must not be unpacked as a result
+            if isinstance(outcome, BaseException):
+                result, result_data = f"Error: {str(outcome)}", None
+            else:
+                result, result_data = outcome
 
             # Log individual tool completion if requested
             if log_results:
                 if len(tool_requests) == 1:
                     # Single tool - just log results
-                    self._log_tool_results(tool_name, result, prefix)
+                    self._log_tool_results(tool_name, result_data, prefix)
                 else:
                     # Multiple tools - log completion status and results
-                    from .colors import get_friendly_tool_name
-
-                    friendly_name = get_friendly_tool_name(tool_name)
-                    console.print(
-                        f"   [green][DONE][/green] {prefix}{friendly_name}: ", end=""
-                    )
-                    if tool_name == "reddit_search_for_posts":
-                        console.print(f"'{params.get('query', 'N/A')}'")
-                    elif tool_name == "reddit_get_post_comments":
-                        post_id = params.get("post_id", "N/A")
-                        post_title = self._find_post_title(post_id)
-                        console.print(f"'{post_title[:50]}...'")
-                    else:
-                        console.print("completed")
-
-                    self._log_tool_results(tool_name, result, prefix)
+                    self._log_tool_done(tool_name, params, prefix)
+                    self._log_tool_results(tool_name, result_data, prefix)
 
             results.append(
                 {
                     "tool_name": tool_name,
                     "tool_params": params,
                     "result": result,
+                    "result_data": result_data,
                     "index": original_index,
                 }
             )
 
         return sorted(results, key=lambda x: x["index"])
 
+    def _index_post_titles(self, search_data: dict[str, Any] | None) -> None:
+        """Record post titles from a parsed search result for O(1) lookup later"""
+        if search_data is None:
+            return
+        for post in search_data.get("results", []):
+            post_id = post.get("post_id")
+            if post_id and post_id not in self.state.post_titles:
+                self.state.post_titles[post_id] = post.get("title", "No title")
+
     def _find_post_title(self, post_id: str) -> str:
         """Find post title from previous search results"""
-        for search_result in self.state.research_data.values():
-            try:
-                search_data = json.loads(search_result)
-                if "results" in search_data:  # Reddit search returns "results" key
-                    for post in search_data["results"]:
-                        if post.get("post_id") == post_id:
-                            return post.get("title", "No title")
-            except (json.JSONDecodeError, KeyError):
-                continue
-        return "Unknown Post"
+        return self.state.post_titles.get(post_id, "Unknown Post")
 
     async def _generate_draft_recommendations(self) -> list[dict]:
         """Generate draft insights for critique"""
@@ -396,12 +521,13 @@ class AutonomousRedditConsensus:
     async def _run_research_phase(self, mode: str = "initial") -> str:
         """Run research phase asynchronously - supports both initial and critique modes"""
         if mode == "initial":
-            context = f"User query: {self.state.original_query}"
+            context_parts = [f"User query: {self.state.original_query}"]
             reasoning_method = self._reasoning_turn
             prefix = ""
             finalize_msg = "Finalizing initial research"
         else:  # critique mode
-            context = f"Draft insights: {self.state.draft_recommendations}"
+            drafts = json.dumps(self.state.draft_recommendations, ensure_ascii=False)
+            context_parts = [f"Draft insights: {drafts}"]
             reasoning_method = self._critique_turn
             prefix = "Critique "
             finalize_msg = "Finalizing critique"
@@ -409,7 +535,7 @@ class AutonomousRedditConsensus:
         for i in range(self.max_iterations):
             print(f"\n {prefix}Iteration {i + 1}")
 
-            decision = await reasoning_method(context)
+            decision = await reasoning_method("".join(context_parts))
             self.state.add_reasoning_step(decision.get("reasoning", ""))
 
             if decision.get("action") in ["use_tool", "use_tools"]:
@@ -425,13 +551,13 @@ class AutonomousRedditConsensus:
                 render_dashboard(results)
 
                 # Store results with unified logic
-                context = self._store_tool_results(results, mode, i, prefix, context)
+                self._store_tool_results(results, mode, i, prefix, context_parts)
 
             else:  # finalize
                 console.print(f" {finalize_msg}")
                 break
 
-        return context
+        return "".join(context_parts)
 
     async def _finalize_recommendations(self):
         """Generate and store final insights"""
@@ -491,6 +617,22 @@ class AutonomousRedditConsensus:
             "steps": len(self.state.reasoning_steps),
         }
 
+    async def aclose(self) -> None:
+        """Close the OpenAI client and the shared Reddit session the tools opened.
+
+        The Reddit session is module-wide, so callers that run several agents
+        on one loop should close ``agent.client`` per agent instead and call
+        ``close_reddit_client()`` once at the end, as the CLI does.
+        """
+        await close_reddit_client()
+        await self.client.close()
+
+    async def __aenter__(self) -> "AutonomousRedditConsensus":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     # ===== OUTPUT METHODS =====
 
     def print_results(self):
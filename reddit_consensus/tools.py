@@ -1,17 +1,63 @@
+import asyncio
 import json
+import logging
 from typing import Any
 
 import asyncpraw
+from asyncpraw.models import MoreComments
 
 from .config import (
     DEFAULT_ADAPTIVE_PERCENTILE,
     DEFAULT_MAX_COMMENTS,
+    DEFAULT_MAX_CONCURRENT_COMMENT_FETCHES,
     DEFAULT_MAX_DEPTH,
     DEFAULT_REPLACE_MORE_LIMIT,
     DEFAULT_SORT_BY_SCORE,
     get_reddit_credentials,
 )
 
+logger = logging.getLogger(__name__)
+
+# Tool output is read by the LLM and json.loads, never by people
+_JSON_SEPARATORS = (",", ":")
+
+_REDDIT_URL_PREFIX = "https://reddit.com"
+
+# One client (and so one HTTP session, OAuth token and rate limiter) shared by
+# every tool call on the running event loop
+_reddit_client: asyncpraw.Reddit | None = None
+# Builds the shared client; tests swap in an in-memory stand-in here
+_reddit_factory = asyncpraw.Reddit
+_reddit_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_reddit_client() -> asyncpraw.Reddit:
+    """Return the shared Reddit client, creating it on first use in this loop."""
+    global _reddit_client, _reddit_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _reddit_client is None or _reddit_client_loop is not loop:
+        if _reddit_client is not None:
+            # A client bound to a previous loop can't be reused or closed from
+            # here; callers should close it (agent.aclose()) before that loop ends
+            logger.warning(
+                "Discarding a Reddit client left open by an earlier event loop; "
+                "its HTTP session leaks until garbage collected"
+            )
+        _reddit_client = _reddit_factory(**get_reddit_credentials())
+        _reddit_client_loop = loop
+    return _reddit_client
+
+
+async def close_reddit_client() -> None:
+    """Close the shared Reddit client opened on the running loop, if any."""
+    global _reddit_client, _reddit_client_loop
+
+    client, client_loop = _reddit_client, _reddit_client_loop
+    _reddit_client = _reddit_client_loop = None
+    if client is not None and client_loop is asyncio.get_running_loop():
+        await client.close()
+
 
 def _calculate_score_threshold(scores: list[int], percentile: int = DEFAULT_ADAPTIVE_PERCENTILE) -> int:
     """Calculate adaptive score threshold based on percentile of all scores."""
@@ -28,9 +74,9 @@ def _has_high_scoring_descendant(comment, threshold: int) -> bool:
     if comment.score >= threshold:
         return True
     
-    if hasattr(comment, "replies") and comment.replies:
+    if comment.replies:
         for reply in comment.replies:
-            if hasattr(reply, "body") and _has_high_scoring_descendant(reply, threshold):
+            if not isinstance(reply, MoreComments) and _has_high_scoring_descendant(reply, threshold):
                 return True
     
     return False
@@ -40,45 +86,67 @@ def _build_comment_tree(
     comment, max_depth: int = DEFAULT_MAX_DEPTH, current_depth: int = 0, 
     score_threshold: int = 0, sort_by_score: bool = DEFAULT_SORT_BY_SCORE
 ) -> dict[str, Any]:
-    """Recursively build comment tree structure preserving Reddit hierarchy."""
-    comment_data = {
-        "id": comment.id,
-        "text": comment.body,
-        "score": comment.score,
-        "depth": current_depth,
-        "author": str(comment.author) if comment.author else "[deleted]",
-        "created_utc": comment.created_utc,
-        "parent_id": comment.parent_id,
-        "replies": [],
-        "is_expanded": False,
-        "reply_count": 0,
-    }
-
-    # Process replies if within depth limit
-    if current_depth < max_depth and hasattr(comment, "replies") and comment.replies:
-        try:
-            # Filter and sort replies by score
-            valid_replies = []
-            for reply in comment.replies:
-                if hasattr(reply, "body") and reply.score >= score_threshold:
-                    valid_replies.append(reply)
-            
-            # Sort replies by score if enabled
-            if sort_by_score:
-                valid_replies.sort(key=lambda x: x.score, reverse=True)
-            
-            # Build tree for filtered/sorted replies
-            for reply in valid_replies:
-                reply_data = _build_comment_tree(
-                    reply, max_depth, current_depth + 1, score_threshold, sort_by_score
-                )
-                comment_data["replies"].append(reply_data)
+    """Build comment tree structure preserving Reddit hierarchy.
 
-            comment_data["reply_count"] = len(comment_data["replies"])
-        except Exception:
-            pass  # Skip problematic replies
+    Walks the thread with an explicit stack rather than recursion, so deep
+    threads cost no Python frames and cannot hit the recursion limit.
+    """
+    root_data: dict[str, Any] | None = None
+    stack: list[tuple[Any, int, dict[str, Any] | None]] = [
+        (comment, current_depth, None)
+    ]
 
-    return comment_data
+    while stack:
+        node, depth, parent_data = stack.pop()
+        try:
+            comment_data = {
+                "id": node.id,
+                "text": node.body,
+                "score": node.score,
+                "depth": depth,
+                "author": str(node.author) if node.author else "[deleted]",
+                "created_utc": node.created_utc,
+                "parent_id": node.parent_id,
+                "replies": [],
+                "is_expanded": False,
+                "reply_count": 0,
+            }
+        except Exception:
+            if parent_data is None:
+                raise
+            # Skip a problematic reply (and its subtree), keeping its siblings
+            parent_data["reply_count"] -= 1
+            continue
+
+        if parent_data is None:
+            root_data = comment_data
+        else:
+            parent_data["replies"].append(comment_data)
+
+        # Process replies if within depth limit
+        if depth < max_depth and node.replies:
+            try:
+                # Filter and sort replies by score
+                valid_replies = [
+                    reply
+                    for reply in node.replies
+                    if not isinstance(reply, MoreComments) and reply.score >= score_threshold
+                ]
+
+                # Sort replies by score if enabled
+                if sort_by_score:
+                    valid_replies.sort(key=lambda x: x.score, reverse=True)
+            except Exception:
+                continue  # Skip problematic replies
+
+            comment_data["reply_count"] = len(valid_replies)
+            # Push in reverse so replies are popped, and appended, in order
+            for reply in reversed(valid_replies):
+                stack.append((reply, depth + 1, comment_data))
+
+    # The root is built first and re-raises on failure, so it's always set here
+    assert root_data is not None
+    return root_data
 
 
 async def reddit_get_post_comments(
@@ -102,99 +170,133 @@ async def reddit_get_post_comments(
     Returns:
         A JSON string containing the hierarchical comment tree.
     """
-    credentials = get_reddit_credentials()
-
-    async with asyncpraw.Reddit(**credentials) as reddit:
-        try:
-            submission = await reddit.submission(id=post_id)
-            await submission.load()
-
-            # Replace "more comments" with actual comments, but limit for performance
+    reddit = _get_reddit_client()
+
+    try:
+        # Any: asyncpraw's CommentForest iterates via __getitem__, which mypy
+        # doesn't accept as iterable
+        submission: Any = await reddit.submission(id=post_id)
+        await submission.load()
+
+        # Replace "more comments" with actual comments, but limit for performance.
+        # Each expansion is an extra request, so skip it when the initial load
+        # already has enough top-level comments; leftover MoreComments are
+        # filtered out below.
+        loaded_top_level = sum(
+            not isinstance(comment, MoreComments) for comment in submission.comments
+        )
+        if include_all_replies or loaded_top_level < max_comments:
             await submission.comments.replace_more(
                 limit=0 if include_all_replies else DEFAULT_REPLACE_MORE_LIMIT
             )
 
-            # Collect all comments for adaptive filtering
-            all_comments = []
-            all_scores = []
-            
-            def collect_scores(comment_obj):
-                """Recursively collect all comment scores."""
-                if hasattr(comment_obj, "body"):
-                    all_scores.append(comment_obj.score)
-                    if hasattr(comment_obj, "replies") and comment_obj.replies:
-                        for reply in comment_obj.replies:
-                            collect_scores(reply)
-            
-            # First pass: collect all comments and scores
-            for comment in submission.comments:
-                if hasattr(comment, "body"):
-                    all_comments.append(comment)
-                    collect_scores(comment)
-            
-            # Calculate adaptive threshold
-            score_threshold = 0
-            if adaptive_filtering and all_scores:
-                score_threshold = _calculate_score_threshold(all_scores)
-            
-            # Filter and sort top-level comments (include if comment OR any descendant is high-scoring)
-            valid_comments = []
-            for comment in all_comments:
-                if adaptive_filtering:
-                    if _has_high_scoring_descendant(comment, score_threshold):
-                        valid_comments.append(comment)
-                else:
+        # Collect all comments for adaptive filtering
+        all_comments = []
+        all_scores = []
+        
+        def collect_scores(comment_obj):
+            """Recursively collect all comment scores."""
+            if not isinstance(comment_obj, MoreComments):
+                all_scores.append(comment_obj.score)
+                if comment_obj.replies:
+                    for reply in comment_obj.replies:
+                        collect_scores(reply)
+        
+        # First pass: collect all comments and scores
+        for comment in submission.comments:
+            if not isinstance(comment, MoreComments):
+                all_comments.append(comment)
+                collect_scores(comment)
+        
+        # Calculate adaptive threshold
+        score_threshold = 0
+        if adaptive_filtering and all_scores:
+            score_threshold = _calculate_score_threshold(all_scores)
+        
+        # Filter and sort top-level comments (include if comment OR any descendant is high-scoring)
+        valid_comments = []
+        for comment in all_comments:
+            if adaptive_filtering:
+                if _has_high_scoring_descendant(comment, score_threshold):
                     valid_comments.append(comment)
-            
-            # Sort comments by score if enabled
-            if sort_by_score:
-                valid_comments.sort(key=lambda x: x.score, reverse=True)
-            
-            # Build comment tree with filtered/sorted comments
-            comments_tree = []
-            comment_count = 0
-
-            for comment in valid_comments:
-                comment_data = _build_comment_tree(comment, max_depth, 0, score_threshold, sort_by_score)
-                comments_tree.append(comment_data)
-                comment_count += 1
-
-                if not include_all_replies and comment_count >= max_comments:
-                    break
-
-            return json.dumps(
-                {
-                    "post_id": post_id,
-                    "post_title": submission.title,
-                    "post_created_utc": submission.created_utc,
-                    "post_author": str(submission.author)
-                    if submission.author
-                    else "[deleted]",
-                    "status": "success",
-                    "comment_tree": comments_tree,
-                    "total_comments": len(comments_tree),
-                    "max_depth": max_depth,
-                    "adaptive_filtering": adaptive_filtering,
-                    "score_threshold": score_threshold,
-                    "total_scores_analyzed": len(all_scores),
-                },
-                indent=2,
-            )
-
-        except Exception as e:
-            return json.dumps(
-                {
-                    "post_id": post_id,
-                    "status": "error",
-                    "error": str(e),
-                    "comment_tree": [],
-                },
-                indent=2,
-            )
+            else:
+                valid_comments.append(comment)
+        
+        # Sort comments by score if enabled
+        if sort_by_score:
+            valid_comments.sort(key=lambda x: x.score, reverse=True)
+        
+        # Build comment tree with filtered/sorted comments
+        comments_tree = []
+        comment_count = 0
+
+        for comment in valid_comments:
+            comment_data = _build_comment_tree(comment, max_depth, 0, score_threshold, sort_by_score)
+            comments_tree.append(comment_data)
+            comment_count += 1
+
+            if not include_all_replies and comment_count >= max_comments:
+                break
+
+        return json.dumps(
+            {
+                "post_id": post_id,
+                "post_title": submission.title,
+                "post_created_utc": submission.created_utc,
+                "post_author": str(submission.author)
+                if submission.author
+                else "[deleted]",
+                "status": "success",
+                "comment_tree": comments_tree,
+                "total_comments": len(comments_tree),
+                "max_depth": max_depth,
+                "adaptive_filtering": adaptive_filtering,
+                "score_threshold": score_threshold,
+                "total_scores_analyzed": len(all_scores),
+            },
+            separators=_JSON_SEPARATORS,
+        )
+
+    except Exception as e:
+        return json.dumps(
+            {
+                "post_id": post_id,
+                "status": "error",
+                "error": str(e),
+                "comment_tree": [],
+            },
+            separators=_JSON_SEPARATORS,
+        )
+
+
+async def _fetch_top_comments(
+    submission, limit: int, semaphore: asyncio.Semaphore
+) -> list[dict[str, Any]]:
+    """Load a submission's comments and return its first top-level comments, without replies.
+
+    Replies aren't built, but reply_count still reports the loaded direct replies.
+    """
+    async with semaphore:
+        await submission.load()
+    top_comments = []
+    for comment in submission.comments:
+        if isinstance(comment, MoreComments):
+            continue
+        comment_data = _build_comment_tree(comment, max_depth=0)
+        comment_data["reply_count"] = sum(
+            not isinstance(reply, MoreComments) for reply in comment.replies
+        )
+        top_comments.append(comment_data)
+        if len(top_comments) >= limit:
+            break
+    return top_comments
 
 
 async def reddit_search_for_posts(
-    query: str, subreddit: str = "all", max_results: int = DEFAULT_MAX_COMMENTS
+    query: str,
+    subreddit: str = "all",
+    max_results: int = DEFAULT_MAX_COMMENTS,
+    include_top_comments: int = 0,
 ) -> str:
     """Search for Reddit posts on a given topic. Returns a list of posts with their IDs.
 
@@ -202,54 +304,69 @@ async def reddit_search_for_posts(
         query: The search query string.
         subreddit: The subreddit to search within. Defaults to "all".
         max_results: The maximum number of posts to return.
+        include_top_comments: If > 0, also fetch up to this many top-level comments
+            per post (concurrently), saving a follow-up comments call per post.
 
     Returns:
         A JSON string containing the search results.
     """
-    credentials = get_reddit_credentials()
-
-    async with asyncpraw.Reddit(**credentials) as reddit:
-        try:
-            subreddit_obj = await reddit.subreddit(subreddit)
-
-            results = []
-            async for submission in subreddit_obj.search(query, limit=max_results):
-                results.append(
-                    {
-                        "post_id": submission.id,
-                        "title": submission.title,
-                        "score": submission.score,
-                        "num_comments": submission.num_comments,
-                        "upvote_ratio": submission.upvote_ratio,
-                        "url": f"https://reddit.com{submission.permalink}",
-                        "snippet": (
-                            submission.selftext[:200] + "..."
-                            if submission.selftext
-                            else ""
-                        ),
-                        "created_utc": submission.created_utc,
-                        "author": str(submission.author)
-                        if submission.author
-                        else "[deleted]",
-                        "subreddit": str(submission.subreddit),
-                    }
-                )
-
-            return json.dumps(
+    reddit = _get_reddit_client()
+
+    try:
+        subreddit_obj = await reddit.subreddit(subreddit)
+
+        results = []
+        submissions = []
+        async for submission in subreddit_obj.search(query, limit=max_results):
+            submissions.append(submission)
+            selftext = submission.selftext
+            author = submission.author
+            results.append(
                 {
-                    "query": query,
-                    "status": "success",
-                    "results": results,
-                    "count": len(results),
-                },
-                indent=2,
+                    "post_id": submission.id,
+                    "title": submission.title,
+                    "score": submission.score,
+                    "num_comments": submission.num_comments,
+                    "upvote_ratio": submission.upvote_ratio,
+                    "url": _REDDIT_URL_PREFIX + submission.permalink,
+                    "snippet": selftext[:200] + "..." if selftext else "",
+                    "created_utc": submission.created_utc,
+                    "author": str(author) if author else "[deleted]",
+                    "subreddit": str(submission.subreddit),
+                }
             )
 
-        except Exception as e:
-            return json.dumps(
-                {"query": query, "status": "error", "error": str(e), "results": []},
-                indent=2,
+        if include_top_comments > 0:
+            # Bounded so a large search can't burst past Reddit's rate limit
+            semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENT_COMMENT_FETCHES)
+            top_comments = await asyncio.gather(
+                *(
+                    _fetch_top_comments(submission, include_top_comments, semaphore)
+                    for submission in submissions
+                ),
+                return_exceptions=True,
             )
+            for result, comments in zip(results, top_comments, strict=True):
+                # A post whose comments failed to load still counts as a search hit
+                result["top_comments"] = (
+                    [] if isinstance(comments, Exception) else comments
+                )
+
+        return json.dumps(
+            {
+                "query": query,
+                "status": "success",
+                "results": results,
+                "count": len(results),
+            },
+            separators=_JSON_SEPARATORS,
+        )
+
+    except Exception as e:
+        return json.dumps(
+            {"query": query, "status": "error", "error": str(e), "results": []},
+            separators=_JSON_SEPARATORS,
+        )
 
 
 # Clean async tools - no sync wrappers needed
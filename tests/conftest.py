@@ -4,9 +4,11 @@ Shared fixtures and settings for all tests
 """
 
 import os
+import socket
 import sys
 
 import pytest
+import pytest_asyncio
 
 # Add the project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -15,22 +17,164 @@ sys.path.insert(0, project_root)
 # Global test configuration
 pytest_plugins = []
 
+# Credentials the agent and tools read; local tests only need them to be set
+REQUIRED_ENV_VARS = [
+    "REDDIT_CLIENT_ID",
+    "REDDIT_CLIENT_SECRET",
+    "REDDIT_USER_AGENT",
+    "OPENAI_API_KEY",
+]
+
+
+def pytest_addoption(parser):
+    """Register the opt-in flag for tests that hit the live Reddit API"""
+    parser.addoption(
+        "--run-remote",
+        action="store_true",
+        default=False,
+        help="run tests marked 'remote', which call the live Reddit API",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip remote tests unless --run-remote is given and real credentials are set"""
+    missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+    if not config.getoption("--run-remote"):
+        skip_remote = pytest.mark.skip(reason="hits live Reddit; use --run-remote")
+    elif missing_vars:
+        skip_remote = pytest.mark.skip(
+            reason=f"Missing required environment variables: {missing_vars}"
+        )
+    else:
+        return
+
+    for item in items:
+        if "remote" in item.keywords:
+            item.add_marker(skip_remote)
+
+
+@pytest.fixture(autouse=True)
+def block_network(request, monkeypatch):
+    """Fail fast if a test not marked remote opens an internet connection"""
+    if "remote" in request.keywords:
+        return
+
+    real_connect = socket.socket.connect
+
+    def guarded_connect(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            raise RuntimeError(
+                f"Network access in a local test (connect to {address!r}); "
+                "stub the call or mark the test remote"
+            )
+        return real_connect(sock, address)
+
+    monkeypatch.setattr(socket.socket, "connect", guarded_connect)
+
+
+# In-memory stand-in for asyncpraw, installed for every local test
+class FakeComment:
+    """Comment with the attributes the tools read"""
+
+    def __init__(self, id, body, score, replies=()):
+        self.id = id
+        self.body = body
+        self.score = score
+        self.author = f"user_{id}"
+        self.created_utc = 1700000000.0
+        self.parent_id = "t3_parent"
+        self.replies = list(replies)
+
+
+class FakeCommentForest(list):
+    """List of top-level comments; nothing to expand in memory"""
+
+    def __init__(self, comments=()):
+        super().__init__(comments)
+        # Limits passed to each replace_more call, so tests can see expansions
+        self.replace_more_calls = []
+
+    async def replace_more(self, limit=32):
+        self.replace_more_calls.append(limit)
+        return []
+
+
+class FakeSubmission:
+    """Submission as returned by search listings or reddit.submission()"""
+
+    def __init__(self, id, title, subreddit="all"):
+        self.id = id
+        self.title = title
+        self.score = 100
+        self.num_comments = 3
+        self.upvote_ratio = 0.95
+        self.permalink = f"/r/{subreddit}/comments/{id}/"
+        self.selftext = f"Discussion thread about {title}. " * 10
+        self.created_utc = 1700000000.0
+        self.author = f"op_{id}"
+        self.subreddit = subreddit
+        self.comments = FakeCommentForest(
+            [
+                FakeComment(
+                    f"{id}_c1",
+                    "Top answer",
+                    50,
+                    replies=[FakeComment(f"{id}_c1r1", "Agreed", 20)],
+                ),
+                FakeComment(f"{id}_c2", "Second answer", 10),
+            ]
+        )
+
+    async def load(self):
+        return self
+
+
+class FakeSubreddit:
+    def __init__(self, name):
+        self.name = name
+
+    async def search(self, query, limit=None):
+        for i in range(limit or 3):
+            yield FakeSubmission(f"post{i}", f"{query} post {i}", self.name)
+
+
+class FakeReddit:
+    """Covers the slice of asyncpraw.Reddit that the tools use"""
+
+    def __init__(self, **credentials):
+        self.credentials = credentials
+        self.closed = False
+        # Every submission handed out, for tests that inspect what was loaded
+        self.submissions = []
 
-# Async test configuration
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    import asyncio
+    async def subreddit(self, name):
+        return FakeSubreddit(name)
+
+    async def submission(self, id):
+        if not id.startswith("post"):
+            raise ValueError(f"received 404 HTTP response for {id}")
+        submission = FakeSubmission(id, f"Post {id}")
+        self.submissions.append(submission)
+        return submission
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_reddit(request, monkeypatch):
+    """Point the tools at FakeReddit for local tests; remote tests get the real client"""
+    if "remote" in request.keywords:
+        return
 
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    yield loop
-    # Don't close the loop if it's still running
-    if not loop.is_closed():
-        loop.close()
+    from reddit_consensus import tools
+
+    monkeypatch.setattr(tools, "_reddit_factory", FakeReddit)
+    monkeypatch.setattr(tools, "_reddit_client", None)
+    monkeypatch.setattr(tools, "_reddit_client_loop", None)
+    # Keep stubbed results out of the session agent's cache
+    if "agent" in request.fixturenames:
+        monkeypatch.setattr(request.getfixturevalue("agent"), "_tool_cache", {})
 
 
 # Environment setup
@@ -40,23 +184,27 @@ def setup_test_environment():
     # Ensure we're running tests
     os.environ["TESTING"] = "1"
 
-    # Check for required environment variables
-    required_env_vars = [
-        "REDDIT_CLIENT_ID",
-        "REDDIT_CLIENT_SECRET",
-        "REDDIT_USER_AGENT",
-        "OPENAI_API_KEY",
-    ]
-
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
-
-    if missing_vars:
-        pytest.skip(f"Missing required environment variables: {missing_vars}")
+    # Local tests never reach the real APIs, so placeholder credentials do;
+    # remote tests without real ones are skipped at collection
+    dummy_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+    for var in dummy_vars:
+        os.environ[var] = "test-placeholder"
 
     yield
 
     # Cleanup
     os.environ.pop("TESTING", None)
+    for var in dummy_vars:
+        os.environ.pop(var, None)
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def close_shared_reddit_client():
+    """Close the tools' shared Reddit client before the session loop goes away"""
+    yield
+    from reddit_consensus.tools import close_reddit_client
+
+    await close_reddit_client()
 
 
 # Test data fixtures
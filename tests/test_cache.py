@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+pytest test suite for the on-disk query result cache
+"""
+
+import json
+import time
+
+import pytest
+
+from reddit_consensus import cache
+from reddit_consensus.cache import (
+    _cache_path,
+    load_cached_result,
+    store_cached_result,
+)
+from reddit_consensus.cli import _is_cacheable
+
+RESULT = {
+    "recommendations": [{"name": "Cafe", "description": "Good coffee"}],
+    "additional_notes": "",
+    "steps": 3,
+}
+
+# Fresh enough that only the entry's shape can make it miss
+NOW = time.time()
+
+
+class TestQueryCache:
+    """Round trips, expiry and malformed entries for the query cache"""
+
+    def test_round_trip_normalises_query(self, tmp_path):
+        """Test case and whitespace differences hit the same entry"""
+        store_cached_result("Best  cafes in Adelaide", RESULT, cache_dir=str(tmp_path))
+
+        assert load_cached_result(" best cafes IN adelaide ", str(tmp_path)) == RESULT
+        assert load_cached_result("best cafes in Sydney", str(tmp_path)) is None
+
+    def test_expired_entry_is_ignored(self, tmp_path, monkeypatch):
+        """Test entries older than the TTL are treated as missing"""
+        store_cached_result("query", RESULT, cache_dir=str(tmp_path))
+        stored_at = time.time()
+        monkeypatch.setattr(cache.time, "time", lambda: stored_at + 120)
+
+        assert load_cached_result("query", str(tmp_path), ttl_seconds=60) is None
+        assert load_cached_result("query", str(tmp_path), ttl_seconds=600) == RESULT
+
+    def test_store_is_atomic(self, tmp_path, monkeypatch):
+        """Test writes leave no temp file and a failed replace keeps the old entry"""
+        store_cached_result("query", RESULT, cache_dir=str(tmp_path))
+        assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(cache.os, "replace", failing_replace)
+        store_cached_result("query", {**RESULT, "steps": 9}, cache_dir=str(tmp_path))
+
+        assert load_cached_result("query", str(tmp_path)) == RESULT
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
+            [],  # Not a dict
+            {"result": RESULT},  # Missing timestamp
+            {"ts": "now", "result": RESULT},  # Non-numeric timestamp
+            {"ts": NOW, "result": "text"},  # Result not a dict
+            {"ts": NOW, "result": {"steps": 1}},  # No recommendations
+            {"ts": NOW, "result": {"recommendations": []}},  # No step count
+        ],
+    )
+    def test_malformed_entry_is_ignored(self, tmp_path, entry):
+        """Test entries of the wrong shape load as None instead of crashing callers"""
+        _cache_path("query", str(tmp_path)).write_text(json.dumps(entry))
+
+        assert load_cached_result("query", str(tmp_path)) is None
+
+    def test_unreadable_entry_is_ignored(self, tmp_path):
+        """Test corrupt files load as None"""
+        _cache_path("query", str(tmp_path)).write_bytes(b"\xff{not json")
+
+        assert load_cached_result("query", str(tmp_path)) is None
+
+    @pytest.mark.parametrize(
+        "result,expected",
+        [
+            (RESULT, True),
+            ({"recommendations": []}, False),
+            ({"recommendations": None}, False),
+            ({}, False),
+            ({"recommendations": [{"name": "Error", "description": "x"}]}, False),
+        ],
+    )
+    def test_is_cacheable(self, result, expected):
+        """Test only real answers, not empty or error fallbacks, are cached"""
+        assert _is_cacheable(result) is expected
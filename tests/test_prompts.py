@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+pytest test suite for prompt templates
+Checks each public helper substitutes its fields in the documented order
+"""
+
+import json
+
+from reddit_consensus.config import DEFAULT_MAX_DEPTH, DEFAULT_RECOMMENDATION_COUNT
+from reddit_consensus.prompts import (
+    get_comments_summary_prompt,
+    get_critique_prompt,
+    get_draft_recommendations_prompt,
+    get_final_recommendations_prompt,
+    get_reasoning_prompt,
+    get_research_data_summary_prompt,
+    get_search_results_summary_prompt,
+)
+
+RESEARCH_DATA = {"search_1": '{"status":"success"}', "comments_2": '{"a":"b"}'}
+
+
+def assert_in_order(prompt: str, *parts: str) -> None:
+    """Assert each part appears in the prompt, in the given order"""
+    positions = [prompt.index(part) for part in parts]
+    assert positions == sorted(positions)
+
+
+class TestPrompts:
+    """Rendering of every public prompt helper"""
+
+    def test_reasoning_prompt(self):
+        """Test static instructions lead, then the query and context, with counters last"""
+        prompt = get_reasoning_prompt(
+            tools_description="TOOLS",
+            original_query="best cafes",
+            research_data_keys=["search_1", "comments_2"],
+            reasoning_steps_count=4,
+            context="CONTEXT",
+        )
+
+        assert f'"max_depth": {DEFAULT_MAX_DEPTH}' in prompt
+        assert_in_order(
+            prompt,
+            "TOOLS",
+            "Respond in JSON format.",
+            "Query: best cafes",
+            "Context: CONTEXT",
+            "- Previous searches: search_1, comments_2",
+        )
+        assert prompt.endswith("- Steps taken: 4")
+
+    def test_reasoning_prompt_without_research(self):
+        """Test an empty research list renders a placeholder"""
+        prompt = get_reasoning_prompt("TOOLS", "query", [], 0, "")
+
+        assert "- Previous searches: (none)" in prompt
+
+    def test_draft_recommendations_prompt(self):
+        """Test research lines and the step count are rendered after the instructions"""
+        prompt = get_draft_recommendations_prompt(
+            original_query="best cafes",
+            research_data=RESEARCH_DATA,
+            reasoning_steps=3,
+            recommendation_count=2,
+        )
+
+        assert_in_order(
+            prompt,
+            "create 2 draft insights",
+            "Original Query: best cafes",
+            'search_1: {"status":"success"}\ncomments_2: {"a":"b"}',
+            "Research Process: 3",
+        )
+
+    def test_critique_prompt(self):
+        """Test the query and context follow the static critique instructions"""
+        prompt = get_critique_prompt("best cafes", "CONTEXT")
+
+        assert_in_order(prompt, "critically analyze", "Original Query: best cafes")
+        assert prompt.endswith("CONTEXT")
+
+    def test_final_recommendations_prompt(self):
+        """Test drafts are rendered as JSON after the research data"""
+        drafts = [{"name": "Café"}]
+        prompt = get_final_recommendations_prompt("best cafes", RESEARCH_DATA, drafts)
+
+        assert f"create {DEFAULT_RECOMMENDATION_COUNT} balanced insights" in prompt
+        assert_in_order(
+            prompt,
+            "Original Query: best cafes",
+            'search_1: {"status":"success"}',
+            f"Draft Insights: {json.dumps(drafts, ensure_ascii=False)}",
+        )
+
+    def test_search_results_summary_prompt(self):
+        """Test search data is substituted ahead of the instructions"""
+        prompt = get_search_results_summary_prompt("SEARCH DATA")
+
+        assert_in_order(prompt, "Search Results Data:\nSEARCH DATA", "Instructions:")
+
+    def test_comments_summary_prompt(self):
+        """Test comments data is substituted ahead of the instructions"""
+        prompt = get_comments_summary_prompt("COMMENTS DATA")
+
+        assert_in_order(prompt, "Comments Data:\nCOMMENTS DATA", "Instructions:")
+
+    def test_research_data_summary_prompt(self):
+        """Test the query and full data are both substituted"""
+        prompt = get_research_data_summary_prompt("best cafes", "FULL DATA")
+
+        assert_in_order(
+            prompt, 'insights for: "best cafes"', "Full Research Data:\nFULL DATA"
+        )
+
+    def test_values_are_not_reparsed(self):
+        """Test "$" in substituted values renders literally"""
+        prompt = get_critique_prompt("under $20", "costs $$5 or $x")
+
+        assert prompt.endswith("Original Query: under $20\n\ncosts $$5 or $x")
@@ -4,11 +4,18 @@ pytest test suite for Reddit tools
 Streamlined tests with minimal redundancy
 """
 
+import asyncio
+import dataclasses
 import json
 
 import pytest
 
-from reddit_consensus.config import get_reddit_credentials
+from reddit_consensus import recommender, tools
+from reddit_consensus.config import (
+    CONFIG,
+    DEFAULT_REPLACE_MORE_LIMIT,
+    get_reddit_credentials,
+)
 from reddit_consensus.recommender import AutonomousRedditConsensus
 from reddit_consensus.tools import (
     _build_comment_tree,
@@ -17,9 +24,9 @@ from reddit_consensus.tools import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def agent():
-    """Shared agent fixture to eliminate boilerplate"""
+    """Shared agent fixture, built once per session; tests must not leave it modified"""
     return AutonomousRedditConsensus()
 
 
@@ -33,8 +40,11 @@ def assert_valid_json_response(result: str, min_length: int = 0) -> dict:
     return data
 
 
-async def get_valid_post_id() -> str:
-    """Helper to get a valid post ID for comment testing"""
+@pytest.fixture
+async def post_id(request) -> str:
+    """A valid post ID for comment testing: a stub post locally, a live one for remote tests"""
+    if "remote" not in request.keywords:
+        return "post0"
     result = await reddit_search_for_posts("python", max_results=1)
     data = json.loads(result)
     if data["results"]:
@@ -45,7 +55,6 @@ async def get_valid_post_id() -> str:
 class TestRedditTools:
     """Comprehensive testing of Reddit tools through agent"""
 
-    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "query,subreddit,max_results,min_length",
         [
@@ -74,7 +83,7 @@ class TestRedditTools:
         if data["results"]:
             post = data["results"][0]
             # Test new fields are present
-            required_fields = [
+            required_fields = {
                 "post_id",
                 "title",
                 "score",
@@ -82,16 +91,13 @@ class TestRedditTools:
                 "created_utc",
                 "author",
                 "subreddit",
-            ]
-            assert all(key in post for key in required_fields)
+            }
+            assert required_fields <= post.keys()
             # Verify timestamp is numeric
             assert isinstance(post["created_utc"], int | float)
 
-    @pytest.mark.asyncio
-    async def test_get_comments_with_subtree_flag(self, agent):
+    async def test_get_comments_with_subtree_flag(self, agent, post_id):
         """Test backward compatibility - include_subtree parameter was removed"""
-        post_id = await get_valid_post_id()
-
         # This should work without any special flags since we always return tree format
         result_list = await agent._execute_tools(
             [
@@ -114,7 +120,6 @@ class TestRedditTools:
         assert "post_created_utc" in data
         assert "post_author" in data
 
-    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "tool_name,params,expected_error",
         [
@@ -141,8 +146,7 @@ class TestRedditTools:
         assert isinstance(result, str)
         assert expected_error in result
 
-    @pytest.mark.asyncio
-    async def test_direct_tool_functions(self):
+    async def test_direct_tool_functions(self, post_id):
         """Test calling tool functions directly"""
         # Test basic functionality
         result = await reddit_search_for_posts("python", max_results=1)
@@ -156,7 +160,6 @@ class TestRedditTools:
             assert "subreddit" in post
 
         # Test hierarchical comments function (now unified)
-        post_id = await get_valid_post_id()
         result = await reddit_get_post_comments(post_id, max_comments=1, max_depth=2)
         data = assert_valid_json_response(result)
         assert "comment_tree" in data
@@ -167,7 +170,15 @@ class TestRedditTools:
         with pytest.raises(TypeError):
             await reddit_search_for_posts()  # Missing required parameter
 
-    @pytest.mark.asyncio
+    @pytest.mark.remote
+    async def test_live_reddit_smoke(self, post_id):
+        """Smoke test both tools against the live Reddit API"""
+        data = assert_valid_json_response(
+            await reddit_get_post_comments(post_id, max_comments=1, max_depth=1)
+        )
+        assert data["status"] == "success"
+        assert "comment_tree" in data
+
     async def test_invalid_post_comments(self, agent):
         """Test comment retrieval with invalid post ID"""
         result_list = await agent._execute_tools(
@@ -185,11 +196,87 @@ class TestRedditTools:
         # Should handle gracefully, might return empty results or error
         assert "comments" in data or "error" in data.get("status", "")
 
-    @pytest.mark.asyncio
-    async def test_parallel_tool_execution(self, agent):
-        """Test parallel execution including hierarchical comments"""
-        post_id = await get_valid_post_id()
+    async def test_comment_tree_from_stub(self, agent):
+        """Test comment trees are built, filtered and sorted from the stubbed client"""
+        result_list = await agent._execute_tools(
+            [
+                {
+                    "tool_name": "reddit_get_post_comments",
+                    "tool_params": {
+                        "post_id": "post0",
+                        "max_depth": 1,
+                        "adaptive_filtering": False,
+                    },
+                }
+            ],
+            log_results=False,
+        )
 
+        data = assert_valid_json_response(result_list[0]["result"])
+        assert data["status"] == "success"
+        tree = data["comment_tree"]
+        assert [comment["score"] for comment in tree] == [50, 10]
+        assert tree[0]["reply_count"] == 1
+        assert tree[0]["replies"][0]["depth"] == 1
+
+    @pytest.mark.parametrize(
+        "max_comments,include_all_replies,expected_calls",
+        [
+            (2, False, []),  # Stub post already has 2 top-level comments
+            (3, False, [DEFAULT_REPLACE_MORE_LIMIT]),  # Too few loaded
+            (1, True, [0]),  # Expanding everything is always requested
+        ],
+    )
+    async def test_replace_more_skipped_when_enough_loaded(
+        self, max_comments, include_all_replies, expected_calls
+    ):
+        """Test "more comments" are only expanded when the initial load falls short"""
+        result = await reddit_get_post_comments(
+            "post0",
+            max_comments=max_comments,
+            include_all_replies=include_all_replies,
+        )
+
+        assert_valid_json_response(result)
+        submission = tools._reddit_client.submissions[-1]
+        assert submission.comments.replace_more_calls == expected_calls
+
+    async def test_search_with_top_comments(self):
+        """Test search results can carry each post's top comments"""
+        result = await reddit_search_for_posts(
+            "python", max_results=2, include_top_comments=1
+        )
+
+        data = assert_valid_json_response(result)
+        assert data["count"] == 2
+        for post in data["results"]:
+            assert len(post["top_comments"]) == 1
+            assert post["top_comments"][0]["replies"] == []
+            # Replies aren't built, but their count is still real
+            assert post["top_comments"][0]["reply_count"] == 1
+
+    async def test_search_summary_keeps_top_comments(self, agent, monkeypatch):
+        """Test the reasoning-context search summary carries truncated top comments"""
+        monkeypatch.setattr(
+            recommender, "CONFIG", dataclasses.replace(CONFIG, context_snippet_length=3)
+        )
+        result = await reddit_search_for_posts(
+            "python", max_results=1, include_top_comments=2
+        )
+
+        summary = json.loads(
+            agent._summarize_tool_result(
+                "reddit_search_for_posts", result, json.loads(result)
+            )
+        )
+        post = summary["posts"][0]
+        assert post["top_comments"] == [
+            {"score": 50, "text": "Top"},
+            {"score": 10, "text": "Sec"},
+        ]
+
+    async def test_parallel_tool_execution(self, agent, post_id):
+        """Test parallel execution including hierarchical comments"""
         # Execute multiple tools in parallel
         result_list = await agent._execute_tools(
             [
@@ -227,6 +314,81 @@ class TestRedditTools:
             "status", ""
         )
 
+    async def test_tool_result_cache(self, agent, monkeypatch):
+        """Test repeated tool calls are served from the agent's cache"""
+        calls = []
+
+        async def fake_search(query, max_results=1):
+            calls.append(query)
+            return json.dumps({"query": query, "status": "success", "results": []})
+
+        async def failing_search(query):
+            calls.append(query)
+            return json.dumps({"query": query, "status": "error", "results": []})
+
+        # Stub the session-wide agent's tools and cache for this test only
+        monkeypatch.setattr(
+            agent,
+            "tools",
+            {"fake_search": fake_search, "failing_search": failing_search},
+        )
+        monkeypatch.setattr(agent, "_tool_cache", {})
+
+        # Parameter order doesn't matter for the cache key
+        first = await agent._execute_single_tool(
+            "fake_search", {"query": "python", "max_results": 2}
+        )
+        second = await agent._execute_single_tool(
+            "fake_search", {"max_results": 2, "query": "python"}
+        )
+        assert first == second
+        assert first[1]["status"] == "success"
+        assert calls == ["python"]
+
+        # Errors are not cached
+        await agent._execute_single_tool("failing_search", {"query": "x"})
+        await agent._execute_single_tool("failing_search", {"query": "x"})
+        assert calls == ["python", "x", "x"]
+
+        # Duplicates within one batch share a single call
+        request = {"tool_name": "failing_search", "tool_params": {"query": "y"}}
+        results = await agent._execute_tools([request, request], log_results=False)
+        assert [r["index"] for r in results] == [0, 1]
+        assert results[0]["result_data"] == json.loads(results[0]["result"])
+        assert calls == ["python", "x", "x", "y"]
+
+    async def test_cancelled_tool_call(self, agent, monkeypatch):
+        """Test a cancelled call in a batch is reported as an error, not unpacked"""
+
+        async def cancelled_search(query):
+            raise asyncio.CancelledError()
+
+        monkeypatch.setattr(agent, "tools", {"cancelled_search": cancelled_search})
+
+        results = await agent._execute_tools(
+            [{"tool_name": "cancelled_search", "tool_params": {"query": "x"}}],
+            log_results=False,
+        )
+        assert results[0]["result"].startswith("Error")
+        assert results[0]["result_data"] is None
+
+    async def test_agent_context_closes_reddit_client(self):
+        """Test leaving the agent's context closes the shared Reddit session"""
+        async with AutonomousRedditConsensus() as scoped_agent:
+            await scoped_agent._execute_tools(
+                [
+                    {
+                        "tool_name": "reddit_search_for_posts",
+                        "tool_params": {"query": "python", "max_results": 1},
+                    }
+                ],
+                log_results=False,
+            )
+            client = tools._reddit_client
+
+        assert client.closed
+        assert tools._reddit_client is None
+
     def test_comment_tree_building_function(self):
         """Test the comment tree building helper function"""
 
@@ -254,11 +416,33 @@ class TestRedditTools:
         assert result["reply_count"] == 0
         assert result["created_utc"] == 1234567890
 
-    @pytest.mark.asyncio
-    async def test_timestamp_data_consistency(self, agent):
-        """Test that timestamp data is consistently captured across all tools"""
-        post_id = await get_valid_post_id()
+        # A reply that fails to build is skipped without losing its siblings
+        class BrokenComment(MockComment):
+            @property
+            def parent_id(self):
+                raise AttributeError("parent_id")
+
+            @parent_id.setter
+            def parent_id(self, value):
+                pass
+
+        thread = MockComment(
+            "1",
+            "Parent",
+            9,
+            replies=[
+                MockComment("2", "Good reply", 3),
+                BrokenComment("3", "Broken reply", 2),
+                MockComment("4", "Another reply", 1),
+            ],
+        )
+        result = _build_comment_tree(thread, max_depth=2)
+
+        assert [reply["id"] for reply in result["replies"]] == ["2", "4"]
+        assert result["reply_count"] == 2
 
+    async def test_timestamp_data_consistency(self, agent, post_id):
+        """Test that timestamp data is consistently captured across all tools"""
         # Test comment tool for timestamp consistency with different parameters
         tools_to_test = [
             ("reddit_get_post_comments", {}),
@@ -293,8 +477,9 @@ class TestRedditTools:
         try:
             credentials = get_reddit_credentials()
             assert isinstance(credentials, dict)
-            required_keys = ["client_id", "client_secret", "user_agent"]
-            assert all(key in credentials for key in required_keys)
+            required_keys = {"client_id", "client_secret", "user_agent"}
+            assert required_keys <= credentials.keys()
+            assert all(credentials.values())
         except ValueError as e:
             # If credentials are missing, that's expected in test environment
             assert "Reddit API credentials not found" in str(e)